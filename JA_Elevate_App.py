@@ -1,106 +1,171 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 import re
 
 
-def is_zip_code(series):
-    """Check if a column contains ZIP codes (5-digit or 9-digit format)."""
-    sample = series.dropna().astype(str).head(100)
-    if len(sample) == 0:
-        return False
-    zip_pattern = re.compile(r'^\d{5}(-\d{4})?$')
-    matches = sample.apply(lambda x: bool(zip_pattern.match(x.strip())))
-    return matches.mean() > 0.5
+# Results each st.cache_data function keeps before evicting the oldest
+CACHE_MAX_ENTRIES = 16
+
+ZIP_PATTERN = re.compile(r'^\d{5}(?:-\d{4})?$')
+ID_PATTERN = re.compile(r'^\d-\d{8}$')
+# Match various phone formats: 555-123-4567, (555) 123-4567, 5551234567
+PHONE_PATTERN = re.compile(r'^[\(]?\d{3}[\)\-\.\s]?\d{3}[\-\.\s]?\d{4}$')
+# Values that look like dates (contain separators like /, -, or month names).
+# This prevents plain numbers from being interpreted as dates.
+DATE_PATTERN = re.compile(
+    r'(?:\d{1,4}[-/]\d{1,2}[-/]\d{1,4})|'  # Date with separators: 2024-01-15, 01/15/2024
+    r'(?:\d{1,2}[-/]\d{1,2}[-/]\d{2,4})|'  # Short year formats
+    r'(?:[A-Za-z]{3,9}[\s,.-]+\d{1,2}[\s,.-]+\d{2,4})|'  # Jan 15, 2024
+    r'(?:\d{1,2}[\s,.-]+[A-Za-z]{3,9}[\s,.-]+\d{2,4})'   # 15 Jan 2024
+)
 
+# Currency symbols, thousands separators and percent signs
+NUMERIC_FORMATTING_PATTERN = re.compile(r'[\$,€%]')
+
+PRIVATE_SCHOOL = 'Private School (includes Montessori, Homeschool, etc)'
+# Cleaned school type values mapped to their standardized names
+SCHOOL_TYPE_REPLACEMENTS = {
+    'nan': 'Empty',
+    'NaN': 'Empty',
+    'NAN': 'Empty',
+    '': 'Empty',
+    'PRVT': PRIVATE_SCHOOL,
+    'Prvt': PRIVATE_SCHOOL,
+    'Charter School': 'Charter',
+}
+
+# Exclusion reasons by regex group name, checked in order; the first one
+# matching most of a column wins
+EXCLUSION_REASONS = {
+    'id': 'ID',
+    'zip': 'ZIP Code',
+    'phone': 'Phone Number',
+}
+# All the exclusion patterns as one alternation, so each sampled value is
+# scanned once and the named group that matched tells which pattern it was
+EXCLUSION_PATTERN = re.compile('|'.join(
+    f'(?P<{group}>{pattern.pattern})'
+    for group, pattern in [
+        ('id', ID_PATTERN),
+        ('zip', ZIP_PATTERN),
+        ('phone', PHONE_PATTERN),
+    ]
+))
+
+
+def as_str(series):
+    """
+    Cast a series to strings, unless it already holds strings.
 
-def is_id_format(series):
-    """Check if a column contains IDs in X-XXXXXXXX format."""
-    sample = series.dropna().astype(str).head(100)
-    if len(sample) == 0:
+    Arrow-backed strings only accept regex patterns as plain strings in
+    their .str methods, so pass `PATTERN.pattern` rather than the compiled
+    pattern to those.
+    """
+    # Object columns may mix strings with numbers, so only a real string
+    # dtype is passed through as-is
+    if isinstance(series.dtype, pd.StringDtype):
+        return series
+    return series.astype('string[pyarrow]')
+
+
+def is_date_sample(sample):
+    """Check if a sample of stripped string values contains dates."""
+    # Require at least 50% to look like actual date strings, so numbers
+    # (plain or formatted), grade spans, fractions and such are left alone
+    looks_like_date = sample.str.contains(DATE_PATTERN.pattern)
+    if looks_like_date.mean() < 0.5:
         return False
-    id_pattern = re.compile(r'^\d-\d{8}$')
-    matches = sample.apply(lambda x: bool(id_pattern.match(x.strip())))
-    return matches.mean() > 0.5
 
+    # Only the date-shaped values need parsing
+    converted = pd.to_datetime(
+        sample[looks_like_date], errors='coerce', format='mixed'
+    )
+    return converted.notna().sum() / len(sample) > 0.5
 
-def is_phone_number(series):
-    """Check if a column contains phone numbers."""
-    sample = series.dropna().astype(str).head(100)
-    if len(sample) == 0:
-        return False
-    # Match various phone formats: 555-123-4567, (555) 123-4567, 5551234567
-    phone_pattern = re.compile(r'^[\(]?\d{3}[\)\-\.\s]?\d{3}[\-\.\s]?\d{4}$')
-    matches = sample.apply(lambda x: bool(phone_pattern.match(x.strip())))
-    return matches.mean() > 0.5
 
+def classify_column(series):
+    """
+    Classify a column that looks numeric but should be excluded.
 
-def is_date_column(series):
-    """Check if a column contains date/datetime values."""
+    Returns:
+        The exclusion reason ('ID', 'ZIP Code', 'Phone Number' or 'Date'),
+        or None if the column isn't one of these types.
+    """
     # Check if already datetime dtype
     if pd.api.types.is_datetime64_any_dtype(series):
-        return True
+        return 'Date'
+
+    # Build the sample once and share it between all the detectors
+    sample = as_str(series.dropna().head(100)).str.strip()
+    if len(sample) == 0:
+        return None
+
+    match_rates = sample.str.extract(EXCLUSION_PATTERN.pattern).notna().mean()
+    for group, reason in EXCLUSION_REASONS.items():
+        if match_rates[group] > 0.5:
+            return reason
 
     # Skip columns that are purely numeric (int/float) - these are NOT dates
-    if pd.api.types.is_numeric_dtype(series):
-        return False
+    if not pd.api.types.is_numeric_dtype(series) and is_date_sample(sample):
+        return 'Date'
+    return None
 
-    # Try to parse as dates only for object/string columns
-    sample = series.dropna().head(100)
-    if len(sample) == 0:
-        return False
 
-    # Convert to string for pattern matching
-    sample_str = sample.astype(str)
-    
-    # Check if values look like dates (contain separators like /, -, or month names)
-    # This prevents plain numbers from being interpreted as dates
-    date_pattern = re.compile(
-        r'(\d{1,4}[-/]\d{1,2}[-/]\d{1,4})|'  # Date with separators: 2024-01-15, 01/15/2024
-        r'(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})|'  # Short year formats
-        r'([A-Za-z]{3,9}[\s,.-]+\d{1,2}[\s,.-]+\d{2,4})|'  # Jan 15, 2024
-        r'(\d{1,2}[\s,.-]+[A-Za-z]{3,9}[\s,.-]+\d{2,4})'   # 15 Jan 2024
-    )
-    
-    looks_like_date = sample_str.apply(lambda x: bool(date_pattern.search(str(x).strip())))
-    
-    # Require at least 50% to look like actual date strings
-    if looks_like_date.mean() < 0.5:
-        return False
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def list_sheet_names(file_bytes):
+    """List the sheet names in an Excel workbook."""
+    return pd.ExcelFile(BytesIO(file_bytes), engine='calamine').sheet_names
 
-    try:
-        converted = pd.to_datetime(sample, errors='coerce')
-        success_rate = converted.notna().sum() / len(sample)
-        return success_rate > 0.5
-    except Exception:
-        return False
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def load_sheet(file_bytes, sheet_name, rows_to_skip=0):
+    """
+    Parse a single sheet of an Excel workbook into a DataFrame.
+
+    The first row is used as the header, and the `rows_to_skip` rows right
+    below it are dropped while parsing.
+    """
+    return pd.read_excel(
+        BytesIO(file_bytes),
+        sheet_name=sheet_name,
+        skiprows=range(1, rows_to_skip + 1),
+        engine='calamine',
+    )
 
 
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
 def detect_excluded_columns(df):
     """Detect columns that look numeric but should be excluded."""
+    # Columns are independent and the regex/parsing work happens in
+    # pandas' C code, so classify them in parallel
+    with ThreadPoolExecutor() as executor:
+        reasons = list(executor.map(
+            classify_column, [df[col] for col in df.columns]
+        ))
     excluded = {}
-    for col in df.columns:
-        if is_id_format(df[col]):
-            excluded[col] = 'ID'
-        elif is_zip_code(df[col]):
-            excluded[col] = 'ZIP Code'
-        elif is_phone_number(df[col]):
-            excluded[col] = 'Phone Number'
-        elif is_date_column(df[col]):
-            excluded[col] = 'Date'
+    for col, reason in zip(df.columns, reasons):
+        if reason is not None:
+            excluded[col] = reason
     return excluded
 
 
 def clean_for_numeric(series):
     """Clean common formatting before numeric conversion."""
-    if series.dtype == 'object':
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    if pd.api.types.is_string_dtype(series.dtype):
+        # Blank values become empty strings, which to_numeric turns into NaN
         cleaned = (
-            series.astype(str)
+            as_str(series)
             .str.strip()
-            .str.replace(r'[\$,€%]', '', regex=True)
-            .str.replace(r'^\s*$', 'NaN', regex=True)
+            .str.replace(NUMERIC_FORMATTING_PATTERN.pattern, '', regex=True)
+        )
+        return pd.to_numeric(
+            cleaned, errors='coerce', dtype_backend='pyarrow'
         )
-        return pd.to_numeric(cleaned, errors='coerce')
     return pd.to_numeric(series, errors='coerce')
 
 
@@ -119,27 +184,39 @@ def convert_numeric_columns(df, excluded_cols, force_include, force_exclude):
     """
     auto_numeric = []
     final_excluded = {}
+
+    # Clean every column that may become numeric up front, in parallel
+    to_clean = [
+        col for col in df.columns
+        if col not in force_exclude
+        and (col in force_include or col not in excluded_cols)
+    ]
+    with ThreadPoolExecutor() as executor:
+        cleaned = dict(zip(
+            to_clean,
+            executor.map(clean_for_numeric, [df[col] for col in to_clean])
+        ))
     
     for col in df.columns:
         # Skip if force excluded
         if col in force_exclude:
-            df[col] = df[col].astype(str)
+            df[col] = as_str(df[col])
             continue
         
         # Force include overrides auto-exclusion
         if col in force_include:
-            df[col] = clean_for_numeric(df[col])
+            df[col] = cleaned[col]
             auto_numeric.append(col)
             continue
         
         # Check if auto-excluded
         if col in excluded_cols:
-            df[col] = df[col].astype(str)
+            df[col] = as_str(df[col])
             final_excluded[col] = excluded_cols[col]
             continue
         
         # Try numeric conversion
-        converted = clean_for_numeric(df[col])
+        converted = cleaned[col]
         non_null_count = len(df[col].dropna())
         
         if non_null_count > 0:
@@ -148,89 +225,54 @@ def convert_numeric_columns(df, excluded_cols, force_include, force_exclude):
                 df[col] = converted
                 auto_numeric.append(col)
             else:
-                df[col] = df[col].astype(str)
+                df[col] = as_str(df[col])
         else:
-            df[col] = df[col].astype(str)
+            df[col] = as_str(df[col])
     
     return df, auto_numeric, final_excluded
 
 
-# Page configuration
-st.set_page_config(
-    page_title="CDP - Student Counts & Aggregations",
-    page_icon="📊",
-    layout="wide"
-)
-
-st.title("📊 CDP - Student Counts & Aggregations")
-st.markdown(
-    "Upload an Excel file to get student counts aggregated by Group By Column."
-)
+def split_column_types(df):
+    """
+    Split the columns of a DataFrame into text and numeric columns.
 
-# File uploader
-uploaded_file = st.file_uploader("Choose an Excel file", type=["xlsx"])
+    Returns:
+        Tuple of (text_cols, numeric_cols)
+    """
+    text_cols = []
+    numeric_cols = []
+    for col, dtype in df.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype):
+            continue
+        if pd.api.types.is_numeric_dtype(dtype):
+            numeric_cols.append(col)
+        elif pd.api.types.is_string_dtype(dtype):
+            text_cols.append(col)
+    return text_cols, numeric_cols
 
-# Initialize session state for tracking file changes and overrides
-if 'last_file_name' not in st.session_state:
-    st.session_state.last_file_name = None
-if 'force_include' not in st.session_state:
-    st.session_state.force_include = []
-if 'force_exclude' not in st.session_state:
-    st.session_state.force_exclude = []
 
-# Reset overrides when a new file is uploaded
-if uploaded_file is not None:
-    if st.session_state.last_file_name != uploaded_file.name:
-        st.session_state.last_file_name = uploaded_file.name
-        st.session_state.force_include = []
-        st.session_state.force_exclude = []
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def results_to_excel(result_df):
+    """Write the aggregated results to an in-memory Excel file."""
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        result_df.to_excel(writer, index=False, sheet_name='Student Counts')
+    return output.getvalue()
 
-if uploaded_file is not None:
-    # Get available sheet names from the Excel file
-    excel_file = pd.ExcelFile(uploaded_file)
-    sheet_names = excel_file.sheet_names
-    
-    # Configuration section
-    st.subheader("⚙️ Configuration")
-    col1, col2 = st.columns(2)
 
-    with col1:
-        # Find default index for "School Info" if it exists
-        default_sheet_idx = 0
-        for i, name in enumerate(sheet_names):
-            if name.lower() == "school info":
-                default_sheet_idx = i
-                break
-        sheet_name = st.selectbox(
-            "Select Sheet",
-            options=sheet_names,
-            index=default_sheet_idx
-        )
-    with col2:
-        rows_to_skip = st.number_input(
-            "Header Rows to Skip",
-            min_value=0,
-            max_value=10,
-            value=2
-        )
+@st.fragment
+def column_type_panel(df, excluded_cols, parsed_key):
+    """
+    Render the column type overrides, detection feedback and column
+    selection for a parsed sheet.
 
-    # Load the data
+    Runs as a fragment, so changing the overrides or the selected columns
+    reruns only this panel and not the sheet loading and detection.
+    """
     try:
-        df = pd.read_excel(excel_file, sheet_name=sheet_name)
-
-        # Skip header rows if specified
-        if rows_to_skip > 0:
-            df = df.iloc[rows_to_skip:].reset_index(drop=True)
-
-        # Detect columns that should be excluded (IDs, ZIPs, phones)
-        excluded_cols = detect_excluded_columns(df)
-
         # Get available columns for override selection
         all_columns = df.columns.tolist()
         excluded_col_names = list(excluded_cols.keys())
-        potential_text_cols = [
-            c for c in all_columns if c not in excluded_col_names
-        ]
 
         # Manual override controls
         st.subheader("🎛️ Column Type Overrides")
@@ -265,10 +307,21 @@ if uploaded_file is not None:
             )
             st.session_state.force_exclude = force_exclude
 
-        # Convert column types dynamically
-        df, auto_numeric_cols, final_excluded = convert_numeric_columns(
-            df, excluded_cols, force_include, force_exclude
+        # Convert column types dynamically, only when the sheet or the
+        # overrides changed. The conversion works on a copy so the parsed
+        # sheet stays untouched for the next change.
+        converted_key = (
+            parsed_key, frozenset(force_include), frozenset(force_exclude)
         )
+        if st.session_state.get('converted_key') != converted_key:
+            st.session_state.converted = convert_numeric_columns(
+                df.copy(), excluded_cols, force_include, force_exclude
+            )
+            st.session_state.column_types = split_column_types(
+                st.session_state.converted[0]
+            )
+            st.session_state.converted_key = converted_key
+        df, auto_numeric_cols, final_excluded = st.session_state.converted
 
         # Display auto-detection feedback
         st.subheader("🔍 Auto-Detected Column Types")
@@ -303,25 +356,20 @@ if uploaded_file is not None:
         st.subheader("🔧 Column Selection")
         col3, col4 = st.columns(2)
 
-        # Separate columns by type
-        text_cols = df.select_dtypes(
-            include=['object', 'string']
-        ).columns.tolist()
-        numeric_cols_list = df.select_dtypes(
-            include=['number']
-        ).columns.tolist()
+        # Columns separated by type, computed along with the conversion
+        text_cols, numeric_cols_list = st.session_state.column_types
 
-        # Smart defaults - try to find matching column names
-        default_school_type_idx = 0
-        default_student_count_idx = 0
-
-        for i, col in enumerate(text_cols):
-            if "school type" in col.lower():
-                default_school_type_idx = i
-
-        for i, col in enumerate(numeric_cols_list):
-            if "students" in col.lower() or "pending" in col.lower():
-                default_student_count_idx = i
+        # Smart defaults - use the first matching column name
+        default_school_type_idx = next(
+            (i for i, col in enumerate(text_cols)
+             if "school type" in str(col).lower()),
+            0
+        )
+        default_student_count_idx = next(
+            (i for i, col in enumerate(numeric_cols_list)
+             if "students" in str(col).lower() or "pending" in str(col).lower()),
+            0
+        )
 
         with col3:
             if not text_cols:
@@ -345,6 +393,16 @@ if uploaded_file is not None:
                     index=default_student_count_idx
                 )
 
+        results_panel(df, school_type_col, student_count_col)
+    except Exception as e:
+        # Fragment reruns skip the page-level error handling
+        st.error(f"❌ An error occurred: {e}")
+
+
+@st.fragment
+def results_panel(df, school_type_col, student_count_col):
+    """Render the Generate button and the aggregated results."""
+    try:
         # Process button
         if st.button("🚀 Generate Student Counts", type="primary"):
             # Validate columns
@@ -359,7 +417,14 @@ if uploaded_file is not None:
                 validation_passed = False
 
             if validation_passed:
-                # Check if student count column is numeric
+                # Clean a copy of just the selected columns, leaving the
+                # converted sheet in session state as it was
+                df = df[[school_type_col, student_count_col]].copy()
+
+            if validation_passed and not pd.api.types.is_numeric_dtype(
+                df[student_count_col]
+            ):
+                # Convert student count column only if not already numeric
                 try:
                     df[student_count_col] = pd.to_numeric(
                         df[student_count_col], errors='coerce'
@@ -375,25 +440,27 @@ if uploaded_file is not None:
                 # Data cleaning
                 st.subheader("🧹 Data Cleaning Applied")
 
+                # Factorize the school types once; the missing value count and the
+                # cleaning below only look at the distinct values
+                codes, school_types = pd.factorize(
+                    df[school_type_col], sort=False, use_na_sentinel=False
+                )
+                school_types = as_str(pd.Series(school_types))
+
                 # Fill missing values instead of removing rows
                 # This helps identify data that needs to be filled in the source Excel
                 # Handle both actual NaN and string "nan" (from earlier string conversion)
-                categorical_missing = (
-                    df[school_type_col].isna().sum() + 
-                    df[school_type_col].astype(str).str.lower().str.strip().isin(['nan', '']).sum()
+                missing_types = (
+                    school_types.isna() |
+                    school_types.str.lower().str.strip().isin(['nan', ''])
                 )
+                type_counts = np.bincount(codes, minlength=len(school_types))
+                categorical_missing = int(type_counts[missing_types.to_numpy()].sum())
                 numeric_missing = df[student_count_col].isna().sum()
-                
-                # Fill categorical column: handle actual NaN, string "nan", and empty strings
-                df[school_type_col] = df[school_type_col].fillna("Empty")
-                df[school_type_col] = df[school_type_col].astype(str).str.strip()
-                df[school_type_col] = df[school_type_col].replace(
-                    ['nan', 'NaN', 'NAN', ''], 'Empty'
-                )
-                
+
                 # Fill numeric column with 0
                 df[student_count_col] = df[student_count_col].fillna(0)
-                
+
                 if categorical_missing > 0 or numeric_missing > 0:
                     st.warning(
                         f"⚠️ Found missing data: {categorical_missing} empty values in "
@@ -402,18 +469,6 @@ if uploaded_file is not None:
                         f"Consider updating the source Excel file."
                     )
 
-                # Standardize Private Schools
-                df[school_type_col] = df[school_type_col].replace(
-                    ['PRVT', 'Prvt'],
-                    'Private School (includes Montessori, Homeschool, etc)'
-                )
-
-                # Standardize Charter Schools
-                df[school_type_col] = df[school_type_col].replace(
-                    'Charter School',
-                    'Charter'
-                )
-
                 st.success(
                     "✅ Whitespace trimmed and school types standardized "
                     "(PRVT/Prvt → Private School, Charter School → Charter)"
@@ -422,12 +477,33 @@ if uploaded_file is not None:
                 # Aggregate by School Type
                 st.subheader("📊 Student Counts by School Type")
 
-                result_df = (
-                    df.groupby(school_type_col)[student_count_col]
-                    .sum()
-                    .reset_index()
+                # Clean only the distinct school types: fill missing ones (actual
+                # NaN, string "nan" and empty strings) and standardize names in a
+                # single replace
+                school_types = (
+                    school_types
+                    .fillna("Empty")
+                    .str.strip()
+                    .replace(SCHOOL_TYPE_REPLACEMENTS)
+                )
+
+                # Several raw values can standardize to the same school type,
+                # so collapse those and remap the row codes
+                type_codes, school_types = pd.factorize(school_types, sort=False)
+                codes = type_codes[codes]
+
+                # Sum the values per integer code, without building a groupby
+                # index
+                values = df[student_count_col].to_numpy()
+                totals = np.bincount(
+                    codes, weights=values, minlength=len(school_types)
                 )
-                result_df.columns = [school_type_col, f'Total {student_count_col}']
+                if pd.api.types.is_integer_dtype(values.dtype):
+                    totals = totals.astype(values.dtype)
+                result_df = pd.DataFrame({
+                    school_type_col: school_types,
+                    f'Total {student_count_col}': totals,
+                })
                 result_df = result_df.sort_values(
                     f'Total {student_count_col}', ascending=False
                 )
@@ -448,23 +524,96 @@ if uploaded_file is not None:
                 # Download button
                 st.subheader("📥 Download Results")
 
-                # Create Excel file in memory
-                output = BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    result_df.to_excel(
-                        writer, index=False, sheet_name='Student Counts'
-                    )
-                output.seek(0)
-
                 st.download_button(
                     label="📥 Download as Excel",
-                    data=output,
+                    data=results_to_excel(result_df),
                     file_name="Results.xlsx",
                     mime=(
                         "application/vnd.openxmlformats-"
                         "officedocument.spreadsheetml.sheet"
                     )
                 )
+    except Exception as e:
+        # Fragment reruns skip the page-level error handling
+        st.error(f"❌ An error occurred: {e}")
+
+
+# Page configuration
+st.set_page_config(
+    page_title="CDP - Student Counts & Aggregations",
+    page_icon="📊",
+    layout="wide"
+)
+
+st.title("📊 CDP - Student Counts & Aggregations")
+st.markdown(
+    "Upload an Excel file to get student counts aggregated by Group By Column."
+)
+
+# File uploader
+uploaded_file = st.file_uploader("Choose an Excel file", type=["xlsx"])
+
+# Initialize session state for tracking file changes and overrides
+if 'last_file_name' not in st.session_state:
+    st.session_state.last_file_name = None
+if 'force_include' not in st.session_state:
+    st.session_state.force_include = []
+if 'force_exclude' not in st.session_state:
+    st.session_state.force_exclude = []
+
+# Reset overrides when a new file is uploaded
+if uploaded_file is not None:
+    if st.session_state.last_file_name != uploaded_file.name:
+        st.session_state.last_file_name = uploaded_file.name
+        st.session_state.force_include = []
+        st.session_state.force_exclude = []
+
+if uploaded_file is not None:
+    # Get available sheet names from the Excel file. Parsing is cached on
+    # the file contents so widget interactions don't re-read the workbook.
+    file_bytes = uploaded_file.getvalue()
+    sheet_names = list_sheet_names(file_bytes)
+    
+    # Configuration section
+    st.subheader("⚙️ Configuration")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Find default index for "School Info" if it exists
+        default_sheet_idx = next(
+            (i for i, name in enumerate(sheet_names)
+             if name.lower() == "school info"),
+            0
+        )
+        sheet_name = st.selectbox(
+            "Select Sheet",
+            options=sheet_names,
+            index=default_sheet_idx
+        )
+    with col2:
+        rows_to_skip = st.number_input(
+            "Header Rows to Skip",
+            min_value=0,
+            max_value=10,
+            value=2
+        )
+
+    # Load the data
+    try:
+        # Keep the parsed sheet and its detected exclusions in session state
+        # so reruns that don't change the inputs skip hashing the DataFrame
+        parsed_key = (hash(file_bytes), sheet_name, rows_to_skip)
+        if st.session_state.get('parsed_key') != parsed_key:
+            df = load_sheet(file_bytes, sheet_name, rows_to_skip)
+
+            # Detect columns that should be excluded (IDs, ZIPs, phones)
+            st.session_state.excluded_cols = detect_excluded_columns(df)
+            st.session_state.parsed_df = df
+            st.session_state.parsed_key = parsed_key
+        df = st.session_state.parsed_df
+        excluded_cols = st.session_state.excluded_cols
+
+        column_type_panel(df, excluded_cols, parsed_key)
 
     except ValueError as e:
         st.error(f"❌ Error reading sheet '{sheet_name}': {e}")